@@ -29,6 +29,11 @@ model = LocalModel(model_name="SpeakLeash/bielik-4.5b-v3.0-instruct:Q8_0")  # Po
 init_db()
 print("✅ Backend gotowy!")
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Zamyka połączenia narzędzi MCP (klient HTTP Tavily) przy wyłączaniu"""
+    await mcp_registry.aclose()
+
 class ChatRequest(BaseModel):
     messages: List[dict]  # [{role: "user"|'assistant'|'system', text: "..."}]
     max_tokens: int = 512
@@ -154,13 +159,11 @@ Styl: Krótko, konkretnie, szczerze. Jak kolega programista, nie HR-owiec.{files
         # Sprawdź czy są wywołania narzędzi
         tool_calls = []
         if use_tools:
-            tool_calls_parsed = parse_tool_call_from_text(out)
-
-            for tc in tool_calls_parsed:
-                result = mcp_registry.execute_tool(tc["tool"], **tc["args"])
+            for tc in parse_tool_call_from_text(out):
+                result = await mcp_registry.execute_tool_async(tc.tool, **tc.args)
                 tool_calls.append({
-                    "tool": tc["tool"],
-                    "args": tc["args"],
+                    "tool": tc.tool,
+                    "args": tc.args,
                     "result": result
                 })
 
@@ -18,60 +18,210 @@ Każde narzędzie ma:
 
 import os
 import json
+import asyncio
 import subprocess
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import inspect
 from pathlib import Path
-from typing import Dict, Any, List, Callable
+from typing import Dict, Any, List, Callable, Iterator, NamedTuple, Optional, Tuple
+import ast
+import codecs
 import math
 import re
+from functools import cache, lru_cache
+from types import MappingProxyType
 from datetime import datetime, timedelta
 
-# Import narzędzi badawczych
 try:
-    from research_tools import research_tools
-    HAS_RESEARCH_TOOLS = True
+    import orjson
 except ImportError:
-    HAS_RESEARCH_TOOLS = False
-    print("⚠️ Research tools nie załadowane - Tavily nie dostępna")
+    import json as orjson
+
+_PY_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_worker.py")
+_PY_TIMEOUT_SECONDS = 5
+
+# Blokowane fragmenty kodu dla execute_python - jedno przejście zamiast skanu per wzorzec
+_DANGEROUS_RE = re.compile(r"import\s+os|import\s+sys|exec|eval|__")
+
+# Wzorzec wywołania narzędzia: [TOOL:nazwa]argumenty[/TOOL]
+_TOOL_RE = re.compile(r'\[TOOL:(\w+)\](.*?)\[/TOOL\]', re.DOTALL)
+
+# Narzędzia, których pozycyjny argument to query / url
+_POSITIONAL_QUERY_TOOLS = frozenset({
+    "web_search", "calculator", "count_words",
+    "tavily_search", "tavily_search_scrape", "deep_research"
+})
+_POSITIONAL_URL_TOOLS = frozenset({"tavily_scrape"})
+
+# Środowisko kalkulatora - budowane raz przy imporcie, tylko do odczytu
+_CALC_LOCALS = MappingProxyType({
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "sqrt": math.sqrt, "pi": math.pi, "e": math.e,
+    "log": math.log, "abs": abs, "pow": pow
+})
+_CALC_GLOBALS = {"__builtins__": {}}
+_CALC_FUNCTIONS = frozenset({"sin", "cos", "tan", "sqrt", "log", "abs", "pow"})
+
+# Tablica usuwająca dozwolone znaki - jeśli po translate coś zostaje, wyrażenie jest niedozwolone.
+# Litery przepuszczamy (sin, pi, ...) - o dozwolonych nazwach decyduje _CalcValidator
+_CALC_ALLOWED = str.maketrans(
+    "", "",
+    "0123456789+-*/().,^ \t\n\r\v\f"
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+)
+
+# Podgląd pliku: tyle znaków zwracamy, tyle bajtów maksymalnie czytamy (UTF-8 = max 4 B/znak)
+_READ_PREVIEW_CHARS = 500
+_READ_PREVIEW_BYTES = _READ_PREVIEW_CHARS * 4 + 4
+
+# count_words: słowo = ciąg znaków niebiałych (jak str.split())
+_WORD_RE = re.compile(r"\S+")
+_COUNT_WORDS_SPLIT_LIMIT = 100_000
+
+
+class _CalcValidator(ast.NodeVisitor):
+    """Przepuszcza tylko arytmetykę, stałe i funkcje z _CALC_LOCALS"""
+
+    _ALLOWED = (
+        ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+        ast.Constant, ast.operator, ast.unaryop
+    )
+
+    def generic_visit(self, node):
+        if not isinstance(node, self._ALLOWED):
+            raise ValueError(f"niedozwolona konstrukcja: {type(node).__name__}")
+        super().generic_visit(node)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _CALC_FUNCTIONS or node.keywords:
+            raise ValueError("niedozwolone wywołanie funkcji")
+        self.generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id not in _CALC_LOCALS:
+            raise ValueError(f"nieznana nazwa: {node.id}")
+        self.generic_visit(node)
+
+    def visit_Constant(self, node):
+        if not isinstance(node.value, (int, float, complex)):
+            raise ValueError("dozwolone są tylko liczby")
+
+
+@lru_cache(maxsize=256)
+def _compile_expr(expression: str):
+    """Parsuje, waliduje i kompiluje wyrażenie (cache dla powtarzanych obliczeń)"""
+    tree = ast.parse(expression, mode="eval")
+    _CalcValidator().visit(tree)
+    return compile(tree, "<calc>", "eval")
+
+
+@cache
+def _get_research():
+    """Leniwy import narzędzi badawczych - ładowane dopiero przy pierwszym użyciu Tavily"""
+    try:
+        from research_tools import research_tools
+        return research_tools
+    except ImportError:
+        print("⚠️ Research tools nie załadowane - Tavily nie dostępna")
+        return None
 
 
 class MCPToolRegistry:
     """Rejestr wszystkich dostępnych narzędzi MCP"""
 
     def __init__(self):
-        self.tools: Dict[str, Dict[str, Any]] = {}
+        # Gorąca ścieżka (execute_tool) czyta tylko _tool_fns; metadane osobno
+        self._tool_fns: Dict[str, Callable] = {}
+        self._async_tool_fns: Dict[str, Callable] = {}  # execute_tool_async
+        self._tool_meta: Dict[str, Tuple[str, str]] = {}
+        self._tool_names_tuple: Tuple[str, ...] = ()
+
+        # Wspólna sesja HTTP dla web_search (DuckDuckGo) - reużywa połączeń
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+        ))
+
+        # Zapasowy, rozgrzany worker dla execute_python (startowany przy pierwszym użyciu)
+        self._py_standby: Optional[subprocess.Popen] = None
+        self._py_lock = threading.Lock()
+
         self._register_default_tools()
         self._register_research_tools()
 
-    def register_tool(self, name: str, description: str, function: Callable):
-        """Rejestruje nowe narzędzie"""
-        self.tools[name] = {
-            "name": name,
-            "description": description,
-            "function": function
-        }
+    def register_tool(self, name: str, description: str, function: Callable, async_function: Optional[Callable] = None):
+        """Rejestruje nowe narzędzie (opcjonalnie z natywną wersją async dla execute_tool_async)"""
+        self._tool_fns[name] = function
+        if async_function is not None:
+            self._async_tool_fns[name] = async_function
+        else:
+            self._async_tool_fns.pop(name, None)
+        self._tool_meta[name] = (name, description)
+        self._tool_names_tuple = tuple(self._tool_fns)
 
     def get_tool(self, name: str) -> Dict[str, Any]:
         """Pobiera narzędzie po nazwie"""
-        return self.tools.get(name)
+        fn = self._tool_fns.get(name)
+        if fn is None:
+            return None
+        tool_name, description = self._tool_meta[name]
+        return {
+            "name": tool_name,
+            "description": description,
+            "function": fn
+        }
+
+    @property
+    def tools(self) -> Dict[str, Dict[str, Any]]:
+        """Widok wszystkich narzędzi w dawnym formacie (budowany na żądanie)"""
+        return {name: self.get_tool(name) for name in self._tool_names_tuple}
 
     def list_tools(self) -> List[str]:
         """Lista wszystkich dostępnych narzędzi"""
-        return list(self.tools.keys())
+        return list(self._tool_names_tuple)
 
     def execute_tool(self, name: str, **kwargs) -> str:
         """Wykonuje narzędzie z podanymi argumentami"""
-        tool = self.get_tool(name)
-        if not tool:
+        fn = self._tool_fns.get(name)
+        if fn is None:
+            return f"❌ Narzędzie '{name}' nie istnieje"
+
+        try:
+            return str(fn(**kwargs))
+        except Exception as e:
+            return f"❌ Błąd wykonania narzędzia '{name}': {str(e)}"
+
+    async def execute_tool_async(self, name: str, **kwargs) -> str:
+        """
+        Wykonuje narzędzie bez blokowania event loopa: wersja async, jeśli
+        zarejestrowana, w przeciwnym razie funkcja synchroniczna w wątku
+        """
+        fn = self._tool_fns.get(name)
+        if fn is None:
             return f"❌ Narzędzie '{name}' nie istnieje"
 
+        async_fn = self._async_tool_fns.get(name)
         try:
-            result = tool["function"](**kwargs)
-            return str(result)
+            if async_fn is not None:
+                return str(await async_fn(**kwargs))
+            return str(await asyncio.to_thread(fn, **kwargs))
         except Exception as e:
             return f"❌ Błąd wykonania narzędzia '{name}': {str(e)}"
 
+    async def aclose(self):
+        """Zwalnia zasoby narzędzi (klient HTTP Tavily, zapasowy worker Pythona)"""
+        # Nie importujemy research_tools tylko po to, żeby je zamknąć
+        if _get_research.cache_info().currsize:
+            research_tools = _get_research()
+            if research_tools is not None:
+                await research_tools.aclose()
+        self._stop_py_worker()
+
     def _register_default_tools(self):
         """Rejestruje domyślny zestaw narzędzi"""
 
@@ -137,37 +287,38 @@ class MCPToolRegistry:
         )
 
     def _register_research_tools(self):
-        """Rejestruje narzędzia badawcze (Tavily)"""
-        
-        if not HAS_RESEARCH_TOOLS:
-            return
+        """Rejestruje narzędzia badawcze (Tavily) - dostępność sprawdzana przy wywołaniu"""
 
         # 8. TAVILY SEARCH - Główne wyszukiwanie
         self.register_tool(
             name="tavily_search",
             description="Wyszukuje informacje przez Tavily AI. Args: query (str), max_age_days (int, default=120), num_results (int, default=10). Filtruje informacje według daty.",
-            function=self._tavily_search
+            function=self._tavily_search,
+            async_function=self._tavily_search_async
         )
 
         # 9. TAVILY SCRAPE - Scrapowanie stron
         self.register_tool(
             name="tavily_scrape",
             description="Pobiera treść strony przez Tavily. Args: url (str), only_main_content (bool, default=True)",
-            function=self._tavily_scrape
+            function=self._tavily_scrape,
+            async_function=self._tavily_scrape_async
         )
 
         # 10. TAVILY SEARCH & SCRAPE - Wyszukiwanie + scrapowanie
         self.register_tool(
             name="tavily_search_scrape",
             description="Wyszukuje i scrapuje pierwsze wyniki. Args: query (str), max_age_days (int, default=120)",
-            function=self._tavily_search_scrape
+            function=self._tavily_search_scrape,
+            async_function=self._tavily_search_scrape_async
         )
 
         # 11. DEEP RESEARCH - Głębokie wyszukiwanie
         self.register_tool(
             name="deep_research",
             description="Głębokie wyszukiwanie w wielu źródłach. Args: query (str), max_age_days (int, default=120)",
-            function=self._deep_research
+            function=self._deep_research,
+            async_function=self._deep_research_async
         )
 
         # 12. RESEARCH STATUS - Status narzędzi
@@ -182,9 +333,15 @@ class MCPToolRegistry:
     def _read_file(self, path: str) -> str:
         """Czyta plik"""
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return f"📄 Zawartość pliku '{path}':\n{content[:500]}..." if len(content) > 500 else f"📄 Zawartość pliku '{path}':\n{content}"
+            # Czytamy tylko początek pliku - koszt stały niezależnie od rozmiaru
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                data = f.read(_READ_PREVIEW_BYTES)
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            content = decoder.decode(data, final=len(data) >= size)
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+            truncated = len(content) > _READ_PREVIEW_CHARS or size > _READ_PREVIEW_CHARS * 4
+            return f"📄 Zawartość pliku '{path}':\n{content[:_READ_PREVIEW_CHARS]}..." if truncated else f"📄 Zawartość pliku '{path}':\n{content}"
         except FileNotFoundError:
             return f"❌ Plik '{path}' nie istnieje"
         except Exception as e:
@@ -207,9 +364,14 @@ class MCPToolRegistry:
     def _list_directory(self, path: str = ".") -> str:
         """Listuje zawartość katalogu"""
         try:
-            items = os.listdir(path)
-            files = [f"📄 {item}" if os.path.isfile(os.path.join(path, item)) else f"📁 {item}" for item in items]
-            return f"📂 Zawartość '{path}':\n" + "\n".join(files[:20])
+            # scandir zna typ wpisu z dirent - bez stat na każdy plik; czytamy tylko 20 wpisów
+            files = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    if len(files) >= 20:
+                        break
+                    files.append(f"📄 {entry.name}" if entry.is_file() else f"📁 {entry.name}")
+            return f"📂 Zawartość '{path}':\n" + "\n".join(files)
         except Exception as e:
             return f"❌ Błąd listowania: {str(e)}"
 
@@ -217,8 +379,8 @@ class MCPToolRegistry:
         """Wyszukuje w internecie (używa DuckDuckGo HTML)"""
         try:
             url = f"https://api.duckduckgo.com/?q={requests.utils.quote(query)}&format=json&pretty=1"
-            response = requests.get(url, timeout=5)
-            data = response.json()
+            response = self._http.get(url, timeout=5)
+            data = orjson.loads(response.content)
 
             if data.get("AbstractText"):
                 return f"🔍 Wynik dla '{query}':\n{data['AbstractText']}"
@@ -234,17 +396,14 @@ class MCPToolRegistry:
     def _calculator(self, expression: str) -> str:
         """Kalkulator matematyczny"""
         try:
-            allowed_chars = set("0123456789+-*/().^ ")
-            if not all(c in allowed_chars or c.isspace() for c in expression):
+            if expression.translate(_CALC_ALLOWED):
                 return "❌ Niedozwolone znaki w wyrażeniu"
 
-            expression = expression.replace("^", "**")
+            # ast.parse nie przyjmuje wcięcia na początku (eval(str) je pomijał); strip normalizuje też klucz cache
+            expression = expression.replace("^", "**").strip()
 
-            result = eval(expression, {"__builtins__": {}}, {
-                "sin": math.sin, "cos": math.cos, "tan": math.tan,
-                "sqrt": math.sqrt, "pi": math.pi, "e": math.e,
-                "log": math.log, "abs": abs, "pow": pow
-            })
+            code = _compile_expr(expression)
+            result = eval(code, _CALC_GLOBALS, _CALC_LOCALS)
 
             return f"🔢 {expression} = {result}"
         except Exception as e:
@@ -253,23 +412,64 @@ class MCPToolRegistry:
     def _execute_python(self, code: str) -> str:
         """Wykonuje kod Python w sandboxie"""
         try:
-            if any(dangerous in code for dangerous in ["import os", "import sys", "exec", "eval", "__"]):
+            if _DANGEROUS_RE.search(code):
                 return "❌ Niebezpieczny kod - zabronione importy"
 
-            result = subprocess.run(
-                ["python3", "-c", code],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            worker = self._take_py_worker()
+            try:
+                stdout, stderr = worker.communicate(code, timeout=_PY_TIMEOUT_SECONDS)
+            except subprocess.TimeoutExpired:
+                worker.kill()
+                worker.communicate()
+                raise
 
-            output = result.stdout or result.stderr
+            output = stdout or stderr
             return f"🐍 Wynik:\n{output[:500]}"
         except subprocess.TimeoutExpired:
             return "❌ Timeout - kod wykonywał się za długo"
         except Exception as e:
             return f"❌ Błąd wykonania: {str(e)}"
 
+    def _take_py_worker(self) -> subprocess.Popen:
+        """
+        Zwraca rozgrzany worker dla jednego snippetu i od razu startuje zapasowy
+        dla następnego wywołania - start interpretera odbywa się poza ścieżką żądania
+        """
+        with self._py_lock:
+            worker, self._py_standby = self._py_standby, None
+        if worker is None or worker.poll() is not None:
+            worker = self._spawn_py_worker()
+        threading.Thread(target=self._refill_py_standby, daemon=True).start()
+        return worker
+
+    def _refill_py_standby(self):
+        """Startuje zapasowego workera w tle (nadmiarowy, gdy ktoś nas uprzedził, jest zabijany)"""
+        worker = self._spawn_py_worker()
+        with self._py_lock:
+            if self._py_standby is None:
+                self._py_standby, worker = worker, None
+        if worker is not None:
+            worker.kill()
+            worker.wait()
+
+    def _spawn_py_worker(self) -> subprocess.Popen:
+        """Uruchamia proces workera czekający na kod na stdin"""
+        return subprocess.Popen(
+            ["python3", "-u", _PY_WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+
+    def _stop_py_worker(self):
+        """Zabija zapasowego workera (np. przy zamykaniu aplikacji)"""
+        with self._py_lock:
+            if self._py_standby is not None:
+                self._py_standby.kill()
+                self._py_standby.wait()
+                self._py_standby = None
+
     def _system_info(self) -> str:
         """Informacje systemowe"""
         import platform
@@ -289,41 +489,71 @@ class MCPToolRegistry:
 
     def _count_words(self, text: str) -> str:
         """Liczy słowa w tekście"""
-        words = len(text.split())
         chars = len(text)
-        lines = len(text.split("\n"))
+        lines = text.count("\n") + 1
+        # Dla dużych tekstów nie budujemy listy wszystkich słów naraz
+        if chars < _COUNT_WORDS_SPLIT_LIMIT:
+            words = len(text.split())
+        else:
+            words = sum(1 for _ in _WORD_RE.finditer(text))
         return f"📊 Statystyki tekstu:\n- Słowa: {words}\n- Znaki: {chars}\n- Linie: {lines}"
 
     # ========== TAVILY RESEARCH TOOLS ==========
 
     def _tavily_search(self, query: str, max_age_days: int = 120, num_results: int = 10) -> str:
         """Wyszukiwanie przez Tavily AI"""
-        if not HAS_RESEARCH_TOOLS:
+        research_tools = _get_research()
+        if research_tools is None:
             return "❌ Narzędzia badawcze nie są dostępne. Sprawdź czy TAVILY_API_KEY jest ustawione."
         
         result = research_tools.search(query, max_age_days=max_age_days, num_results=num_results)
-        
+        return self._format_tavily_search(query, result)
+
+    async def _tavily_search_async(self, query: str, max_age_days: int = 120, num_results: int = 10) -> str:
+        """Wyszukiwanie przez Tavily AI (async)"""
+        research_tools = _get_research()
+        if research_tools is None:
+            return "❌ Narzędzia badawcze nie są dostępne. Sprawdź czy TAVILY_API_KEY jest ustawione."
+
+        result = await research_tools.search_async(query, max_age_days=max_age_days, num_results=num_results)
+        return self._format_tavily_search(query, result)
+
+    def _format_tavily_search(self, query: str, result: Dict) -> str:
+        """Formatuje wynik tavily_search"""
         if result.get("success"):
-            lines = [f"🔍 Wyniki wyszukiwania dla '{query}':", ""]
-            for i, r in enumerate(result.get("results", []), 1):
-                lines.append(f"{i}. {r.get('title', 'Brak tytułu')}")
-                lines.append(f"   URL: {r.get('url')}")
-                lines.append(f"   {r.get('content', '')[:150]}...")
-                lines.append("")
-            lines.append(f"Znaleziono: {result.get('total_found')} wyników")
+            body = "".join(
+                f"{i}. {r.get('title') or 'Brak tytułu'}\n"
+                f"   URL: {r.get('url')}\n"
+                f"   {(r.get('content') or '')[:150]}...\n\n"
+                for i, r in enumerate(result.get("results", []), 1)
+            )
+            footer = f"Znaleziono: {result.get('total_found')} wyników"
             if result.get("filtered_by_date"):
-                lines.append("✅ Przefiltrowane według daty (tylko świeże źródła)")
-            return "\n".join(lines)
+                footer += "\n✅ Przefiltrowane według daty (tylko świeże źródła)"
+            return f"🔍 Wyniki wyszukiwania dla '{query}':\n\n{body}{footer}"
         else:
             return f"❌ Błąd wyszukiwania: {result.get('error', result.get('message', 'Nieznany błąd'))}"
 
     def _tavily_scrape(self, url: str, only_main_content: bool = True) -> str:
         """Scrapowanie strony przez Tavily"""
-        if not HAS_RESEARCH_TOOLS:
+        research_tools = _get_research()
+        if research_tools is None:
             return "❌ Narzędzia badawcze nie są dostępne."
         
-        result = research_tools.scrape(url, only_main_content=only_main_content)
-        
+        result = research_tools.scrape(url, only_main_content=only_main_content, max_chars=3000)
+        return self._format_tavily_scrape(url, result)
+
+    async def _tavily_scrape_async(self, url: str, only_main_content: bool = True) -> str:
+        """Scrapowanie strony przez Tavily (async)"""
+        research_tools = _get_research()
+        if research_tools is None:
+            return "❌ Narzędzia badawcze nie są dostępne."
+
+        result = await research_tools.scrape_async(url, only_main_content=only_main_content, max_chars=3000)
+        return self._format_tavily_scrape(url, result)
+
+    def _format_tavily_scrape(self, url: str, result: Dict) -> str:
+        """Formatuje wynik tavily_scrape"""
         if result.get("success"):
             content = result.get("content", "")[:3000]
             return f"📄 Treść strony {url}:\n\n{content}..."
@@ -332,45 +562,75 @@ class MCPToolRegistry:
 
     def _tavily_search_scrape(self, query: str, max_age_days: int = 120) -> str:
         """Wyszukiwanie + scrapowanie"""
-        if not HAS_RESEARCH_TOOLS:
+        research_tools = _get_research()
+        if research_tools is None:
             return "❌ Narzędzia badawcze nie są dostępne."
         
         result = research_tools.search_and_scrape(query, max_age_days=max_age_days)
-        
+        return self._format_tavily_search_scrape(query, result)
+
+    async def _tavily_search_scrape_async(self, query: str, max_age_days: int = 120) -> str:
+        """Wyszukiwanie + scrapowanie (async)"""
+        research_tools = _get_research()
+        if research_tools is None:
+            return "❌ Narzędzia badawcze nie są dostępne."
+
+        result = await research_tools.search_and_scrape_async(query, max_age_days=max_age_days)
+        return self._format_tavily_search_scrape(query, result)
+
+    def _format_tavily_search_scrape(self, query: str, result: Dict) -> str:
+        """Formatuje wynik tavily_search_scrape"""
         if result.get("success"):
-            lines = [f"🔍 Wyszukiwanie + scrapowanie dla '{query}':", ""]
-            for i, page in enumerate(result.get("scraped_pages", []), 1):
-                lines.append(f"{i}. {page.get('title', page.get('url'))}")
-                content = page.get("content", "")[:200]
-                lines.append(f"   {content}...")
-                lines.append("")
-            lines.append(f"Przeszukano: {result.get('total_scraped')} stron")
-            return "\n".join(lines)
+            body = "".join(
+                f"{i}. {page.get('title') or page.get('url')}\n"
+                f"   {(page.get('content') or '')[:200]}...\n\n"
+                for i, page in enumerate(result.get("scraped_pages", []), 1)
+            )
+            return (
+                f"🔍 Wyszukiwanie + scrapowanie dla '{query}':\n\n{body}"
+                f"Przeszukano: {result.get('total_scraped')} stron"
+            )
         else:
             return f"❌ Błąd: {result.get('error', 'Nieznany błąd')}"
 
     def _deep_research(self, query: str, max_age_days: int = 120) -> str:
         """Głębokie wyszukiwanie"""
-        if not HAS_RESEARCH_TOOLS:
+        research_tools = _get_research()
+        if research_tools is None:
             return "❌ Narzędzia badawcze nie są dostępne."
         
         result = research_tools.deep_research(query, max_age_days=max_age_days)
-        
+        return self._format_deep_research(query, result)
+
+    async def _deep_research_async(self, query: str, max_age_days: int = 120) -> str:
+        """Głębokie wyszukiwanie (async)"""
+        research_tools = _get_research()
+        if research_tools is None:
+            return "❌ Narzędzia badawcze nie są dostępne."
+
+        result = await research_tools.deep_research_async(query, max_age_days=max_age_days)
+        return self._format_deep_research(query, result)
+
+    def _format_deep_research(self, query: str, result: Dict) -> str:
+        """Formatuje wynik deep_research"""
         if result.get("success"):
-            lines = [f"📊 Głębokie wyszukiwanie dla '{query}':", ""]
-            for i, r in enumerate(result.get("results", [])[:10], 1):
-                lines.append(f"{i}. {r.get('title', 'Brak tytułu')}")
-                lines.append(f"   URL: {r.get('url')}")
-                lines.append(f"   {r.get('content', '')[:100]}...")
-                lines.append("")
-            lines.append(f"Znaleziono: {result.get('total_unique')} unikalnych wyników")
-            return "\n".join(lines)
+            body = "".join(
+                f"{i}. {r.get('title') or 'Brak tytułu'}\n"
+                f"   URL: {r.get('url')}\n"
+                f"   {(r.get('content') or '')[:100]}...\n\n"
+                for i, r in enumerate(result.get("results", [])[:10], 1)
+            )
+            return (
+                f"📊 Głębokie wyszukiwanie dla '{query}':\n\n{body}"
+                f"Znaleziono: {result.get('total_unique')} unikalnych wyników"
+            )
         else:
             return f"❌ Błąd: {result.get('error', 'Nieznany błąd')}"
 
     def _research_status(self) -> str:
         """Status narzędzi badawczych"""
-        if not HAS_RESEARCH_TOOLS:
+        research_tools = _get_research()
+        if research_tools is None:
             return "❌ Narzędzia badawcze nie załadowane"
         
         status = research_tools.get_status()
@@ -385,18 +645,22 @@ class MCPToolRegistry:
         return "\n".join(lines)
 
 
-def parse_tool_call_from_text(text: str) -> List[Dict[str, Any]]:
+class ToolCall(NamedTuple):
+    """Pojedyncze wywołanie narzędzia sparsowane z odpowiedzi modelu"""
+    tool: str
+    args: Dict[str, Any]
+
+
+def parse_tool_call_from_text(text: str) -> Iterator[ToolCall]:
     """
     Parsuje wywołania narzędzi z tekstu generowanego przez model.
+    Generator - zwraca kolejne ToolCall(tool, args) w kolejności wystąpienia.
 
     Format: [TOOL:nazwa_narzędzia]argument1|argument2[/TOOL]
     Przykład: [TOOL:calculator]2+2[/TOOL]
     """
-    pattern = r'\[TOOL:(\w+)\](.*?)\[/TOOL\]'
-    matches = re.findall(pattern, text, re.DOTALL)
-
-    tool_calls = []
-    for tool_name, args_text in matches:
+    for match in _TOOL_RE.finditer(text):
+        tool_name, args_text = match.group(1), match.group(2)
         # Parse arguments (simple key=value or positional)
         kwargs = {}
 
@@ -414,21 +678,14 @@ def parse_tool_call_from_text(text: str) -> List[Dict[str, Any]]:
                 parts = args_text.split("|", 1)
                 kwargs["path"] = parts[0].strip()
                 kwargs["content"] = parts[1].strip() if len(parts) > 1 else ""
-            elif tool_name in ["web_search", "calculator", "count_words", "tavily_search", "tavily_scrape", "tavily_search_scrape", "deep_research"]:
-                # Dla narzędzi badawczych - pierwszy argument to query lub url
-                if tool_name == "tavily_scrape":
-                    kwargs["url"] = args_text.strip()
-                else:
-                    kwargs["query"] = args_text.strip()
+            elif tool_name in _POSITIONAL_URL_TOOLS:
+                kwargs["url"] = args_text.strip()
+            elif tool_name in _POSITIONAL_QUERY_TOOLS:
+                kwargs["query"] = args_text.strip()
             else:
                 kwargs["query"] = args_text.strip()
 
-        tool_calls.append({
-            "tool": tool_name,
-            "args": kwargs
-        })
-
-    return tool_calls
+        yield ToolCall(tool_name, kwargs)
 
 
 # Global registry instance
@@ -0,0 +1,38 @@
+"""
+Worker wykonujący kod dla narzędzia MCP execute_python
+======================================================
+
+Proces jednorazowy: MCPToolRegistry uruchamia go z wyprzedzeniem (interpreter
+jest już zainicjalizowany, gdy przychodzi kod), wysyła kod na stdin i zamyka
+go. Worker wykonuje kod jak `python -c` - z prawdziwymi stdout/stderr, więc
+wyjście podprocesów też jest przechwytywane - i kończy działanie.
+
+Jeden snippet = jeden proces, więc żaden snippet nie może zmienić stanu
+interpretera (sys.modules, builtins, wątki) widzianego przez kolejny.
+"""
+
+import io
+import sys
+import traceback
+
+
+def main():
+    code = sys.stdin.read()
+    sys.stdin = io.StringIO("")
+
+    # Środowisko jak przy `python -c`: sys.path[0] = katalog bieżący, argv = ['-c']
+    sys.path[0] = ""
+    sys.argv = ["-c"]
+
+    try:
+        exec(compile(code, "<string>", "exec"), {"__name__": "__main__"})
+    except SystemExit:
+        raise
+    except BaseException as e:
+        # Pomijamy ramkę workera - traceback jak z `python -c`
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
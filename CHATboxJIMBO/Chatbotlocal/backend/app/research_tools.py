@@ -4,15 +4,161 @@ Integracja z Tavily API do wyszukiwania i scrapowania
 """
 
 import os
+import re
+import asyncio
+import importlib.util
 import json
+import time
+import threading
+import warnings
 import requests
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+HAS_H2 = importlib.util.find_spec("h2") is not None
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 # Konfiguracja z .env
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
 SERPER_API_KEY = os.getenv("SERPER_API_KEY", "")
 
+# Maksymalna liczba równoległych zapytań HTTP (= rozmiar puli połączeń)
+MAX_WORKERS = 3
+
+# Cache odpowiedzi Tavily: TTL w sekundach i limit wpisów (LRU)
+SEARCH_CACHE_TTL = 300
+SCRAPE_CACHE_TTL = 900
+CACHE_MAX_ENTRIES = 512
+
+# Strumieniowe pobieranie scrape: rozmiar porcji i minimalny limit bajtów przy max_chars
+SCRAPE_CHUNK_SIZE = 16384
+SCRAPE_MIN_READ_BYTES = 32768
+# Reszta body do tego rozmiaru jest dociągana, żeby połączenie wróciło do puli keep-alive
+SCRAPE_DRAIN_MAX_BYTES = 65536
+# Skaner prefiksu JSON: znaki struktury, reszta stringa po otwierającym cudzysłowie, początek wartości-stringa
+_JSON_STRUCT_RE = re.compile(r'[{}\[\]"]')
+_JSON_STRING_TAIL_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_JSON_STRING_VALUE_RE = re.compile(r'\s*:\s*"')
+
+# Od tylu wyników filtrowanie dat idzie wektorowo przez numpy (jeśli dostępne)
+DATE_FILTER_VECTOR_MIN = 32
+# Daty, które numpy i datetime.fromisoformat czytają identycznie (pełna data ISO, czas opcjonalny, Z opcjonalne)
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}(?::\d{2}(?::\d{2}(?:\.\d{3}|\.\d{6})?)?)?)?Z?")
+
+def _find_top_level_content(text: str) -> Optional[int]:
+    """
+    Pozycja początku wartości klucza content w głównym obiekcie JSON-a (głębokość 1).
+    Klucze content w zagnieżdżonych obiektach są pomijane. None gdy klucza jeszcze nie ma.
+    """
+    depth = 0
+    pos = 0
+    while True:
+        match = _JSON_STRUCT_RE.search(text, pos)
+        if match is None:
+            return None
+        char = match.group()
+        if char == '"':
+            tail = _JSON_STRING_TAIL_RE.match(text, match.end())
+            if tail is None:
+                return None  # prefiks kończy się wewnątrz stringa
+            pos = tail.end()
+            if depth == 1 and text[match.start():pos] == '"content"':
+                value = _JSON_STRING_VALUE_RE.match(text, pos)
+                if value is not None:
+                    return value.end()
+        else:
+            depth += 1 if char in "{[" else -1
+            pos = match.end()
+
+
+def _extract_content_prefix(body: bytes, max_chars: int) -> Optional[str]:
+    """
+    Wyciąga pole content z początku (obciętego) JSON-a.
+    None gdy pola jeszcze nie ma albo prefiks jest krótszy niż max_chars - trzeba czytać dalej.
+    """
+    text = body.decode("utf-8", errors="ignore")
+    start = _find_top_level_content(text)
+    if start is None:
+        return None
+
+    raw = text[start:start + max_chars * 6]
+    try:
+        # Cały string zmieścił się w buforze
+        value, _end = json.decoder.scanstring(raw, 0)
+        return value
+    except json.JSONDecodeError:
+        pass
+
+    # Obcięcie mogło przeciąć sekwencję escape - skracamy aż do poprawnego stringa
+    for _ in range(6):
+        try:
+            value, _end = json.decoder.scanstring(raw + '"', 0)
+            return value if len(value) >= max_chars else None
+        except json.JSONDecodeError:
+            raw = raw[:-1]
+    return None
+
+
+class _ScrapeBody:
+    """
+    Zbiera body odpowiedzi /scrape porcjami. Przy max_chars kończy wcześniej,
+    gdy prefiks zawiera już potrzebną treść; w przeciwnym razie czyta całość.
+    """
+
+    def __init__(self, max_chars: Optional[int]):
+        self.max_chars = max_chars
+        # JSON może mieć ~6 bajtów na znak (\uXXXX) + pozostałe pola
+        self.check_at = None if max_chars is None else max(SCRAPE_MIN_READ_BYTES, max_chars * 6)
+        self.buf = bytearray()
+        self.content: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.content is not None
+
+    def feed(self, chunk: bytes) -> bool:
+        """Dodaje porcję; True gdy treść jest już znana i dalsze body nie jest potrzebne"""
+        self.buf.extend(chunk)
+        if self.check_at is not None and len(self.buf) > self.check_at:
+            self.content = _extract_content_prefix(bytes(self.buf), self.max_chars)
+            # Brak treści w prefiksie (np. duże pola przed content) - sprawdzamy znowu przy 2x
+            self.check_at *= 2
+        return self.done
+
+    def result_content(self) -> str:
+        """Treść - z prefiksu albo z pełnego JSON-a (content ma pierwszeństwo przed markdown)"""
+        if self.content is None:
+            data = orjson.loads(bytes(self.buf))
+            self.content = data.get("content", data.get("markdown", ""))
+        return self.content
+
+
+def _can_drain(content_length: Optional[str], bytes_read: int) -> bool:
+    """Czy reszta body jest na tyle mała, że opłaca się ją doczytać zamiast zrywać połączenie"""
+    if content_length is None or not content_length.isdigit():
+        return False
+    return int(content_length) - bytes_read <= SCRAPE_DRAIN_MAX_BYTES
+
+
 class ResearchTools:
     """Narzędzia do wyszukiwania i scrapowania"""
     
@@ -21,13 +167,132 @@ class ResearchTools:
         self.serper_api_key = SERPER_API_KEY
         self.tavily_base = "https://api.tavily.com"
         self.serper_base = "https://google.serper.dev/search"
-    
+
+        # Wspólna sesja HTTP - keep-alive i pula połączeń zamiast nowego TLS przy każdym wywołaniu
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Bearer {self.tavily_api_key}",
+            "Content-Type": "application/json"
+        })
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=MAX_WORKERS,
+            # /search i /scrape to POST - urllib3 domyślnie ich nie ponawia; po wyczerpaniu prób
+            # zwracamy ostatnią odpowiedź, żeby zadziałała zwykła obsługa "API error: <status>"
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=frozenset({"GET", "POST"}),
+                raise_on_status=False
+            )
+        ))
+
+        # Cache wyników: klucz -> (czas wygaśnięcia, wynik)
+        self._cache: "OrderedDict[tuple, tuple[float, Dict]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Klient async (HTTP/2, multipleksowanie) - tworzony przy pierwszym użyciu *_async
+        self._aclient = None
+        self._aclient_loop = None
+        self._aclient_owner = None
+
+    def _cache_get(self, key: tuple) -> Optional[Dict]:
+        """Zwraca świeży wpis z cache (odświeża jego pozycję LRU) albo None"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+
+    def _cache_put(self, key: tuple, ttl: float, result: Dict):
+        """Zapamiętuje udany wynik; najstarsze wpisy wypadają powyżej limitu"""
+        if not result.get("success"):
+            return
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def _cache_drop(self, key: tuple):
+        """Usuwa wpis z cache (bypass_cache)"""
+        with self._cache_lock:
+            self._cache.pop(key, None)
+
+    def _cached(self, key: tuple, ttl: float, fn, *args, **kwargs) -> Dict:
+        """Zwraca wynik z cache lub wywołuje fn; zapamiętuje tylko udane wyniki"""
+        result = self._cache_get(key)
+        if result is None:
+            result = fn(*args, **kwargs)
+            self._cache_put(key, ttl, result)
+        return result
+
+    async def _cached_async(self, key: tuple, ttl: float, fn, *args, **kwargs) -> Dict:
+        """Wersja _cached dla korutyn - ten sam cache co ścieżka synchroniczna"""
+        result = self._cache_get(key)
+        if result is None:
+            result = await fn(*args, **kwargs)
+            self._cache_put(key, ttl, result)
+        return result
+
+    def clear_cache(self):
+        """Czyści cache wyników Tavily"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    async def _get_aclient(self) -> "httpx.AsyncClient":
+        """
+        Leniwie tworzy klienta httpx (HTTP/2 gdy dostępne h2).
+        Klient jest związany z event loopem, w którym powstał - w innym loopie
+        (np. kolejne asyncio.run) tworzymy nowego.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            client = httpx.AsyncClient(
+                http2=HAS_H2,
+                timeout=30.0,
+                headers={
+                    "Authorization": f"Bearer {self.tavily_api_key}",
+                    "Content-Type": "application/json"
+                },
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+            )
+            # Generator zawieszony na yield: loop.shutdown_asyncgens() (asyncio.run robi to przed
+            # zamknięciem loopa) domyka go i zamyka klienta, póki jego loop jeszcze działa.
+            # Loop zakończony bez shutdown_asyncgens zostawia połączenia do GC.
+            lifetime = self._aclient_lifetime(client)
+            await lifetime.__anext__()
+            self._aclient, self._aclient_loop, self._aclient_owner = client, loop, lifetime
+        return self._aclient
+
+    async def _aclient_lifetime(self, client: "httpx.AsyncClient"):
+        """Trzyma klienta otwartego do zamknięcia generatora (aclose() albo koniec loopa)"""
+        try:
+            yield
+        finally:
+            await client.aclose()
+
+    async def aclose(self):
+        """Zamyka klienta async (np. przy shutdown aplikacji)"""
+        if self._aclient is not None:
+            if self._aclient_loop is asyncio.get_running_loop():
+                await self._aclient_owner.aclose()
+            self._aclient = None
+            self._aclient_loop = None
+            self._aclient_owner = None
+
     def search(
         self, 
         query: str, 
         max_age_days: int = 120, 
         num_results: int = 10,
-        search_depth: str = "advanced"
+        search_depth: str = "advanced",
+        bypass_cache: bool = False
     ) -> Dict:
         """
         Wyszukiwanie w Tavily z filtrowaniem daty
@@ -37,62 +302,79 @@ class ResearchTools:
             max_age_days: Maksymalny wiek informacji (domyślnie 4 miesiące)
             num_results: Liczba wyników
             search_depth: 'basic' lub 'advanced'
+            bypass_cache: Pomiń cache i pobierz świeże wyniki
         
         Returns:
             Dict z wynikami wyszukiwania
         """
+        key = ("search", query, max_age_days, num_results, search_depth)
+        if bypass_cache:
+            self._cache_drop(key)
+        return self._cached(key, SEARCH_CACHE_TTL, self._search, query, max_age_days, num_results, search_depth)
+
+    async def search_async(
+        self,
+        query: str,
+        max_age_days: int = 120,
+        num_results: int = 10,
+        search_depth: str = "advanced",
+        bypass_cache: bool = False
+    ) -> Dict:
+        """Asynchroniczna wersja search() (httpx, HTTP/2) - te same argumenty i wynik"""
+        if not HAS_HTTPX:
+            return await asyncio.to_thread(self.search, query, max_age_days, num_results, search_depth, bypass_cache)
+        key = ("search", query, max_age_days, num_results, search_depth)
+        if bypass_cache:
+            self._cache_drop(key)
+        return await self._cached_async(key, SEARCH_CACHE_TTL, self._search_async, query, max_age_days, num_results, search_depth)
+
+    def _search(self, query: str, max_age_days: int, num_results: int, search_depth: str) -> Dict:
+        """Wyszukiwanie w Tavily bez cache"""
         if not self.tavily_api_key:
             return self._mock_search(query, max_age_days)
         
-        import time
         start_time = time.time()
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.tavily_base}/search",
-                headers={
-                    "Authorization": f"Bearer {self.tavily_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "query": query,
-                    "max_age_days": max_age_days,
-                    "num_results": num_results,
-                    "search_depth": search_depth,
-                    "include_answer": True
-                },
+                json=self._search_payload(query, max_age_days, num_results, search_depth),
                 timeout=30.0
             )
             
             if response.status_code == 200:
-                data = response.json()
-                response_time = round((time.time() - start_time) * 1000, 2)
-                
-                # Filtrowanie wyników według daty
-                cutoff_date = datetime.now() - timedelta(days=max_age_days)
-                filtered_results = []
-                
-                for result in data.get("results", []):
-                    pub_date = result.get("published_date")
-                    if pub_date:
-                        try:
-                            result_date = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
-                            if result_date >= cutoff_date:
-                                filtered_results.append(result)
-                        except:
-                            filtered_results.append(result)
-                    else:
-                        filtered_results.append(result)
-                
+                data = orjson.loads(response.content)
+                return self._search_result(query, max_age_days, num_results, data, start_time)
+            else:
                 return {
-                    "success": True,
-                    "query": query,
-                    "results": filtered_results[:num_results],
-                    "total_found": len(filtered_results),
-                    "filtered_by_date": len(filtered_results) < len(data.get("results", [])),
-                    "response_time_ms": response_time,
-                    "answer": data.get("answer", "")
+                    "success": False,
+                    "error": f"API error: {response.status_code}",
+                    "message": response.text
                 }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Błąd połączenia z Tavily API"
+            }
+
+    async def _search_async(self, query: str, max_age_days: int, num_results: int, search_depth: str) -> Dict:
+        """Wyszukiwanie w Tavily bez cache (async)"""
+        if not self.tavily_api_key:
+            return self._mock_search(query, max_age_days)
+
+        start_time = time.time()
+
+        try:
+            client = await self._get_aclient()
+            response = await client.post(
+                f"{self.tavily_base}/search",
+                json=self._search_payload(query, max_age_days, num_results, search_depth)
+            )
+
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                return self._search_result(query, max_age_days, num_results, data, start_time)
             else:
                 return {
                     "success": False,
@@ -105,58 +387,166 @@ class ResearchTools:
                 "error": str(e),
                 "message": "Błąd połączenia z Tavily API"
             }
+
+    def _search_payload(self, query: str, max_age_days: int, num_results: int, search_depth: str) -> Dict:
+        """Body zapytania /search"""
+        return {
+            "query": query,
+            "max_age_days": max_age_days,
+            "num_results": num_results,
+            "search_depth": search_depth,
+            "include_answer": True
+        }
+
+    def _search_result(self, query: str, max_age_days: int, num_results: int, data: Dict, start_time: float) -> Dict:
+        """Buduje wynik search() z odpowiedzi Tavily"""
+        response_time = round((time.time() - start_time) * 1000, 2)
+
+        # Filtrowanie wyników według daty (porównanie w UTC)
+        cutoff_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=max_age_days)
+        filtered_results = self._filter_by_date(data.get("results", []), cutoff_date)
+
+        return {
+            "success": True,
+            "query": query,
+            "results": filtered_results[:num_results],
+            "total_found": len(filtered_results),
+            "filtered_by_date": len(filtered_results) < len(data.get("results", [])),
+            "response_time_ms": response_time,
+            "answer": data.get("answer", "")
+        }
     
-    def scrape(self, url: str, only_main_content: bool = True) -> Dict:
+    def scrape(
+        self,
+        url: str,
+        only_main_content: bool = True,
+        max_chars: Optional[int] = None,
+        bypass_cache: bool = False
+    ) -> Dict:
         """
         Scrapowanie strony przez Tavily
         
         Args:
             url: URL strony do scrapowania
             only_main_content: Tylko główna treść (bez reklam, nawigacji)
+            max_chars: Ile znaków treści potrzebuje wywołujący (None = całość);
+                ogranicza też ilość pobieranych danych
+            bypass_cache: Pomiń cache i pobierz świeżą treść
         
         Returns:
             Dict z treścią strony
         """
+        key = ("scrape", url, only_main_content, max_chars)
+        if bypass_cache:
+            self._cache_drop(key)
+        return self._cached(key, SCRAPE_CACHE_TTL, self._scrape, url, only_main_content, max_chars)
+
+    async def scrape_async(
+        self,
+        url: str,
+        only_main_content: bool = True,
+        max_chars: Optional[int] = None,
+        bypass_cache: bool = False
+    ) -> Dict:
+        """Asynchroniczna wersja scrape() (httpx, HTTP/2) - te same argumenty i wynik"""
+        if not HAS_HTTPX:
+            return await asyncio.to_thread(self.scrape, url, only_main_content, max_chars, bypass_cache)
+        key = ("scrape", url, only_main_content, max_chars)
+        if bypass_cache:
+            self._cache_drop(key)
+        return await self._cached_async(key, SCRAPE_CACHE_TTL, self._scrape_async, url, only_main_content, max_chars)
+
+    def _scrape(self, url: str, only_main_content: bool, max_chars: Optional[int]) -> Dict:
+        """Scrapowanie strony przez Tavily bez cache"""
         if not self.tavily_api_key:
             return self._mock_scrape(url)
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.tavily_base}/scrape",
-                headers={
-                    "Authorization": f"Bearer {self.tavily_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "url": url,
-                    "only_main_content": only_main_content,
-                    "output_format": "markdown"
-                },
-                timeout=30.0
+                json=self._scrape_payload(url, only_main_content),
+                timeout=30.0,
+                stream=True
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "success": True,
-                    "url": url,
-                    "content": data.get("content", data.get("markdown", "")),
-                    "title": self._extract_title(data.get("content", "")),
-                    "timestamp": datetime.now().isoformat()
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"API error: {response.status_code}",
-                    "url": url
-                }
+            try:
+                if response.status_code != 200:
+                    return {
+                        "success": False,
+                        "error": f"API error: {response.status_code}",
+                        "url": url
+                    }
+
+                body = _ScrapeBody(max_chars)
+                for chunk in response.iter_content(chunk_size=SCRAPE_CHUNK_SIZE):
+                    if body.done:
+                        continue  # dociąganie małej reszty - połączenie zostaje w puli
+                    if body.feed(chunk) and not _can_drain(response.headers.get("Content-Length"), response.raw.tell()):
+                        break
+            finally:
+                # Po niedoczytanym body requests zamyka socket zamiast oddać go do puli
+                response.close()
+            return self._scrape_result(url, body.result_content(), max_chars)
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
                 "url": url
             }
-    
+
+    async def _scrape_async(self, url: str, only_main_content: bool, max_chars: Optional[int]) -> Dict:
+        """Scrapowanie strony przez Tavily bez cache (async, strumieniowo)"""
+        if not self.tavily_api_key:
+            return self._mock_scrape(url)
+
+        try:
+            client = await self._get_aclient()
+            async with client.stream(
+                "POST",
+                f"{self.tavily_base}/scrape",
+                json=self._scrape_payload(url, only_main_content)
+            ) as response:
+                if response.status_code != 200:
+                    return {
+                        "success": False,
+                        "error": f"API error: {response.status_code}",
+                        "url": url
+                    }
+
+                body = _ScrapeBody(max_chars)
+                async for chunk in response.aiter_bytes(SCRAPE_CHUNK_SIZE):
+                    if body.done:
+                        continue
+                    if body.feed(chunk) and not _can_drain(response.headers.get("Content-Length"), response.num_bytes_downloaded):
+                        break
+            return self._scrape_result(url, body.result_content(), max_chars)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "url": url
+            }
+
+    def _scrape_payload(self, url: str, only_main_content: bool) -> Dict:
+        """Body zapytania /scrape"""
+        return {
+            "url": url,
+            "only_main_content": only_main_content,
+            "output_format": "markdown"
+        }
+
+    def _scrape_result(self, url: str, content: str, max_chars: Optional[int]) -> Dict:
+        """Buduje wynik scrape()"""
+        if max_chars is not None:
+            content = content[:max_chars]
+        return {
+            "success": True,
+            "url": url,
+            "content": content,
+            "title": self._extract_title(content),
+            "timestamp": datetime.now().isoformat()
+        }
+
     def search_and_scrape(self, query: str, max_age_days: int = 120) -> Dict:
         """
         Wyszukiwanie + scrapowanie pierwszych wyników
@@ -166,17 +556,49 @@ class ResearchTools:
         if not search_results.get("success"):
             return search_results
         
-        scraped = []
-        for result in search_results.get("results", [])[:3]:
-            url = result.get("url")
-            scrape_result = self.scrape(url)
-            scraped.append({
-                "url": url,
-                "title": result.get("title"),
-                "content": scrape_result.get("content", "")[:2000],
-                "success": scrape_result.get("success", False)
-            })
+        top_results = search_results.get("results", [])[:3]
+        scraped = [None] * len(top_results)
+
+        # Scrapowanie równolegle - każdy wątek korzysta z puli połączeń sesji
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self.scrape, result.get("url"), max_chars=2000): i
+                for i, result in enumerate(top_results)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                scraped[i] = self._scraped_page(top_results[i], future.result())
         
+        return self._search_and_scrape_result(query, search_results, scraped)
+
+    async def search_and_scrape_async(self, query: str, max_age_days: int = 120) -> Dict:
+        """
+        Wyszukiwanie + scrapowanie (async) - scrapy lecą równolegle jednym połączeniem HTTP/2
+        """
+        search_results = await self.search_async(query, max_age_days=max_age_days, num_results=5)
+
+        if not search_results.get("success"):
+            return search_results
+
+        top_results = search_results.get("results", [])[:3]
+        scrape_results = await asyncio.gather(
+            *(self.scrape_async(result.get("url"), max_chars=2000) for result in top_results)
+        )
+        scraped = [self._scraped_page(r, sr) for r, sr in zip(top_results, scrape_results)]
+
+        return self._search_and_scrape_result(query, search_results, scraped)
+
+    def _scraped_page(self, result: Dict, scrape_result: Dict) -> Dict:
+        """Pojedyncza strona w wyniku search_and_scrape"""
+        return {
+            "url": result.get("url"),
+            "title": result.get("title"),
+            "content": scrape_result.get("content", "")[:2000],
+            "success": scrape_result.get("success", False)
+        }
+
+    def _search_and_scrape_result(self, query: str, search_results: Dict, scraped: List[Dict]) -> Dict:
+        """Wynik search_and_scrape"""
         return {
             "success": True,
             "query": query,
@@ -197,31 +619,113 @@ class ResearchTools:
         if sources is None:
             sources = ["tavily"]
         
+        searchers = {
+            "tavily": lambda: self.search(query, max_age_days=max_age_days, num_results=10)
+        }
+        active = [source for source in sources if source in searchers]
+        source_results = [None] * len(active)
+
+        if len(active) == 1:
+            source_results[0] = searchers[active[0]]()
+        elif active:
+            # Wiele źródeł - odpytujemy równolegle, kolejność wyników zgodna z `sources`
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(active))) as executor:
+                futures = {executor.submit(searchers[source]): i for i, source in enumerate(active)}
+                for future in as_completed(futures):
+                    source_results[futures[future]] = future.result()
+
+        return self._deep_research_result(query, sources, source_results)
+
+    async def deep_research_async(
+        self,
+        query: str,
+        sources: Optional[List[str]] = None,
+        max_age_days: int = 120
+    ) -> Dict:
+        """Asynchroniczna wersja deep_research() - źródła odpytywane równolegle"""
+        if sources is None:
+            sources = ["tavily"]
+
+        searchers = {
+            "tavily": lambda: self.search_async(query, max_age_days=max_age_days, num_results=10)
+        }
+        active = [source for source in sources if source in searchers]
+        source_results = await asyncio.gather(*(searchers[source]() for source in active))
+
+        return self._deep_research_result(query, sources, source_results)
+
+    def _deep_research_result(self, query: str, sources: List[str], source_results: List[Dict]) -> Dict:
+        """Łączy wyniki źródeł deep_research() i usuwa duplikaty"""
         all_results = []
+        for source_result in source_results:
+            if source_result.get("success"):
+                all_results.extend(source_result.get("results", []))
         
-        if "tavily" in sources:
-            tavily_results = self.search(query, max_age_days=max_age_days, num_results=10)
-            if tavily_results.get("success"):
-                all_results.extend(tavily_results.get("results", []))
-        
-        # Usuń duplikaty
-        seen_urls = set()
-        unique_results = []
+        # Usuń duplikaty (zostaje pierwsze wystąpienie URL, kolejność zachowana)
+        unique_by_url = {}
         for r in all_results:
             url = r.get("url")
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_results.append(r)
+            if url and url not in unique_by_url:
+                unique_by_url[url] = r
+        unique_results = list(unique_by_url.values())
         
         return {
             "success": True,
             "query": query,
             "results": unique_results[:15],
-            "total_unique": len(unique_results),
+            "total_unique": len(unique_by_url),
             "sources_checked": sources,
             "timestamp": datetime.now().isoformat()
         }
     
+    def _filter_by_date(self, results: List[Dict], cutoff: datetime) -> List[Dict]:
+        """
+        Zostawia wyniki nie starsze niż cutoff (naiwny UTC).
+        Wyniki bez daty lub z nieczytelną datą są zachowywane.
+        """
+        if HAS_NUMPY and len(results) >= DATE_FILTER_VECTOR_MIN:
+            keep = self._date_mask_numpy(results, cutoff)
+            if keep is not None:
+                return [r for r, k in zip(results, keep) if k]
+
+        filtered = []
+        for result in results:
+            result_date = self._parse_published_date(result.get("published_date"))
+            if result_date is None or result_date >= cutoff:
+                filtered.append(result)
+        return filtered
+
+    def _date_mask_numpy(self, results: List[Dict], cutoff: datetime) -> Optional[List[bool]]:
+        """Maska dat przez datetime64; None gdy któraś data wymaga pełnego parsera"""
+        # Daty niebędące stringiem traktujemy jak brak daty - tak samo jak pętla
+        raw = [d if isinstance(d, str) else "" for d in (r.get("published_date") for r in results)]
+        # numpy akceptuje też np. "2020", "2020-01", "today" - takie daty obsługuje tylko pętla
+        if not all(not d or _ISO_DATE_RE.fullmatch(d) for d in raw):
+            return None
+        raw = [d.removesuffix("Z") for d in raw]
+        try:
+            with warnings.catch_warnings():
+                # Strefy czasowe inne niż Z numpy tylko ostrzega - wtedy wolna ścieżka
+                warnings.simplefilter("error")
+                dates = np.array(raw, dtype="datetime64[us]")
+        except (ValueError, UserWarning, DeprecationWarning):
+            return None
+
+        missing = np.isnat(dates)
+        return (missing | (dates >= np.datetime64(cutoff, "us"))).tolist()
+
+    def _parse_published_date(self, pub_date: Optional[str]) -> Optional[datetime]:
+        """Parsuje datę ISO do naiwnego UTC; None gdy brak lub nieczytelna"""
+        if not pub_date or not isinstance(pub_date, str):
+            return None
+        try:
+            result_date = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
+        except (TypeError, ValueError):
+            return None
+        if result_date.tzinfo is not None:
+            result_date = result_date.astimezone(timezone.utc).replace(tzinfo=None)
+        return result_date
+
     def _extract_title(self, content: str) -> str:
         """Ekstrakcja tytułu z treści"""
         lines = content.strip().split("\n")
@@ -269,6 +773,7 @@ class ResearchTools:
             "tavily_configured": bool(self.tavily_api_key),
             "serper_configured": bool(self.serper_api_key),
             "features": ["search", "scrape", "search_and_scrape", "deep_research"],
+            "async_http2": HAS_HTTPX and HAS_H2,
             "default_max_age_days": 120,
             "note": "Ustaw TAVILY_API_KEY w .env aby włączyć prawdziwe wyszukiwanie"
         }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Moduły backendu importują się płasko (jak przy `python main.py` z katalogu app)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
@@ -0,0 +1,44 @@
+from mcp_tools import mcp_registry
+
+
+def test_calculator_math_functions_and_constants():
+    assert mcp_registry.execute_tool("calculator", expression="sin(0) + pi") == "🔢 sin(0) + pi = 3.141592653589793"
+    assert mcp_registry.execute_tool("calculator", expression="pow(2, 10)") == "🔢 pow(2, 10) = 1024"
+    assert mcp_registry.execute_tool("calculator", expression="2^3") == "🔢 2**3 = 8"
+    assert mcp_registry.execute_tool("calculator", expression=" 2 +\t3 ") == "🔢 2 +\t3 = 5"
+    assert mcp_registry.execute_tool("calculator", expression="\n2*3") == "🔢 2*3 = 6"
+
+
+def test_calculator_rejects_unknown_names_and_attributes():
+    assert "nieznana nazwa" in mcp_registry.execute_tool("calculator", expression="x + 1")
+    assert "niedozwolone wywołanie" in mcp_registry.execute_tool("calculator", expression="open(1)")
+    assert "Attribute" in mcp_registry.execute_tool("calculator", expression="abs.real")
+    assert "Niedozwolone znaki" in mcp_registry.execute_tool("calculator", expression="__import__")
+
+
+def test_execute_python_snippets_are_isolated():
+    mcp_registry.execute_tool("execute_python", code="import math; math.pi = 3")
+    assert mcp_registry.execute_tool("execute_python", code="import math; print(math.pi)") == "🐍 Wynik:\n3.141592653589793\n"
+
+    mcp_registry.execute_tool("execute_python", code="import builtins; builtins.print = None")
+    assert mcp_registry.execute_tool("execute_python", code="print('ok')") == "🐍 Wynik:\nok\n"
+
+
+def test_execute_python_captures_subprocess_output():
+    code = "import subprocess; subprocess.run(['python3', '-c', 'print(42)'])"
+    assert mcp_registry.execute_tool("execute_python", code=code) == "🐍 Wynik:\n42\n"
+
+
+def test_execute_tool_async_matches_sync():
+    import asyncio
+
+    assert asyncio.run(mcp_registry.execute_tool_async("calculator", expression="2^3")) == "🔢 2**3 = 8"
+    assert asyncio.run(mcp_registry.execute_tool_async("nope")) == "❌ Narzędzie 'nope' nie istnieje"
+    assert "Błąd wykonania" in asyncio.run(mcp_registry.execute_tool_async("calculator", bad=1))
+
+
+def test_execute_python_blocks_exec_family():
+    blocked = "❌ Niebezpieczny kod - zabronione importy"
+    assert mcp_registry.execute_tool("execute_python", code="from os import execv") == blocked
+    assert mcp_registry.execute_tool("execute_python", code="import  os") == blocked
+    assert mcp_registry.execute_tool("execute_python", code="eval('1')") == blocked
@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from research_tools import DATE_FILTER_VECTOR_MIN, ResearchTools
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _iso_dates():
+    now = _utcnow()
+    return [
+        (now - timedelta(days=1)).isoformat(),
+        (now - timedelta(days=1)).isoformat(timespec="milliseconds") + "Z",
+        (now - timedelta(days=200)).isoformat(timespec="seconds"),
+        (now - timedelta(days=200)).strftime("%Y-%m-%d %H:%M"),
+        (now - timedelta(days=5)).strftime("%Y-%m-%d"),
+        (now - timedelta(days=500)).strftime("%Y-%m-%dT%H"),
+        "",
+        None,
+    ]
+
+
+def _odd_dates():
+    return ["2020", "2020-01", "today", "now", "Mon, 13 Oct 2025 10:00:00 GMT", "2020-01-02T03:04:05+02:00", "2020-02-30"]
+
+
+def _assert_paths_agree(tools, dates):
+    cutoff = _utcnow() - timedelta(days=120)
+    repeat = DATE_FILTER_VECTOR_MIN // len(dates) + 1
+    results = [{"url": f"u{i}", "published_date": d} for i, d in enumerate(dates * repeat)]
+    assert len(results) >= DATE_FILTER_VECTOR_MIN
+
+    batched = tools._filter_by_date(results, cutoff)
+    one_by_one = [r for r in results if tools._filter_by_date([r], cutoff)]
+    assert batched == one_by_one
+
+
+def test_date_filter_numpy_path_matches_loop():
+    pytest.importorskip("numpy")
+    tools = ResearchTools()
+    results = [{"published_date": d} for d in _iso_dates()]
+    assert tools._date_mask_numpy(results, _utcnow()) is not None
+
+    _assert_paths_agree(tools, _iso_dates())
+
+
+@pytest.mark.parametrize("odd", _odd_dates())
+def test_date_filter_non_iso_dates_match_loop(odd):
+    tools = ResearchTools()
+    _assert_paths_agree(tools, _iso_dates() + [odd])
+    _assert_paths_agree(tools, [odd])
+
+
+@pytest.mark.parametrize("odd", [1760000000, 2025.5, {"date": "2020-01-01"}, ["2020-01-01"]])
+def test_date_filter_keeps_non_string_dates(odd):
+    tools = ResearchTools()
+    cutoff = _utcnow() - timedelta(days=120)
+    results = [{"url": f"u{i}", "published_date": odd} for i in range(DATE_FILTER_VECTOR_MIN)]
+    assert tools._filter_by_date(results, cutoff) == results
+    assert tools._filter_by_date(results[:1], cutoff) == results[:1]
+    _assert_paths_agree(tools, _iso_dates() + [odd])
+
+
+class _ScrapeServer:
+    """Lokalny serwer udający /scrape Tavily; liczy nowe połączenia TCP"""
+
+    def __init__(self, body: bytes):
+        import http.server
+        import threading
+
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(server.body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(server.body)
+                except OSError:
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.body = body
+        self.connections = 0
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _scrape_tools(server):
+    tools = ResearchTools()
+    tools.tavily_api_key = "test"
+    tools.tavily_base = server.base
+    return tools
+
+
+@pytest.mark.parametrize("fields", [
+    {"raw_html": "<p>x</p>" * 20000, "content": "# Tytuł\n" + "treść " * 2000},
+    {"markdown": "# Inny\n" + "md " * 20000, "content": "# Tytuł\n" + "treść " * 2000},
+    {"content": "# Tytuł\n" + 'treść "cytat" \\ ż ' * 20000},
+    {"content": "# Tytuł\nkrótko"},
+    {"meta": [{"content": "zagnieżdżone"}], "raw_html": "x" * 40000, "content": "# Tytuł\n" + "treść " * 2000},
+])
+def test_scrape_with_cap_matches_full_parse(fields):
+    import json
+
+    server = _ScrapeServer(json.dumps(fields).encode())
+    try:
+        tools = _scrape_tools(server)
+        capped = tools.scrape("https://example.com", max_chars=3000)
+        full = tools.scrape("https://example.com")
+    finally:
+        server.close()
+
+    assert capped["success"] and full["success"]
+    assert full["content"] == fields["content"]
+    assert capped["content"] == fields["content"][:3000]
+    assert capped["title"] == "Tytuł"
+
+
+def test_scrape_small_remainder_keeps_connection_pooled():
+    import json
+
+    server = _ScrapeServer(json.dumps({"content": "a" * 80000}).encode())
+    try:
+        tools = _scrape_tools(server)
+        for i in range(3):
+            assert tools.scrape(f"https://example.com/{i}", max_chars=2000)["success"]
+    finally:
+        server.close()
+
+    assert server.connections == 1
+
+
+def test_async_client_survives_new_event_loop():
+    import asyncio
+    import json
+
+    server = _ScrapeServer(json.dumps({"results": [], "answer": ""}).encode())
+    try:
+        tools = _scrape_tools(server)
+        # Każde asyncio.run to nowy loop - klient z poprzedniego nie może być użyty
+        assert asyncio.run(tools.search_async("a"))["success"]
+        first_client = tools._aclient
+        assert asyncio.run(tools.search_async("b"))["success"]
+        # Klient poprzedniego loopa zamknięty razem z nim - połączenia nie wiszą
+        assert first_client.is_closed and tools._aclient is not first_client
+        assert asyncio.run(tools.deep_research_async("c"))["success"]
+    finally:
+        server.close()